@@ -80,7 +80,18 @@ def analyze_neighborhood_adoption(config_path: str, output_dir: str):
     target_days = [0, 5, 10, 15, 20, 25]
     available_days = sorted(snapshots['day'].unique())
     target_days = [d for d in target_days if d in available_days]
-    
+
+    # Slice each day once and precompute its neighborhood counts; the claim
+    # loop reuses these instead of re-filtering per claim.
+    day_slices = {}
+    for day in target_days:
+        day_data = snapshots[snapshots['day'] == day]
+        if day_data.empty:
+            continue
+        nid_arr = day_data['neighborhood_id'].to_numpy()
+        counts = np.bincount(nid_arr, minlength=town.neighborhoods)
+        day_slices[day] = (day_data, nid_arr, counts)
+
     for claim_idx, claim_col in enumerate(claim_cols):
         claim_num = claim_col.split('_')[1]
         strain_name = strain_names.get(claim_idx, f'claim_{claim_num}')
@@ -91,38 +102,44 @@ def analyze_neighborhood_adoption(config_path: str, output_dir: str):
         print(f"{'='*100}")
         
         for day in target_days:
-            day_data = snapshots[snapshots['day'] == day].copy()
-            if day_data.empty:
+            if day not in day_slices:
                 continue
-            
+            day_data, nid_arr, counts = day_slices[day]
+
             print(f"\n--- Day {day} ---")
             print(f"{'Neighborhood':<25} {'Edu':<8} {'Income':<12} {'Adoption':<12} {'Mean Belief':<15}")
             print("-" * 85)
-            
+
+            beliefs = day_data[claim_col].to_numpy(dtype=np.float64)
+            adopted = (beliefs >= adoption_threshold).astype(np.float64)
+            safe_counts = np.maximum(counts, 1)
+            adoption_rates = (
+                np.bincount(nid_arr, weights=adopted, minlength=town.neighborhoods) / safe_counts
+            )
+            mean_beliefs = (
+                np.bincount(nid_arr, weights=beliefs, minlength=town.neighborhoods) / safe_counts
+            )
+
+            # Box all stats to native Python types in one record-array pass.
+            present = np.flatnonzero(counts)
+            rec = np.rec.fromarrays(
+                [present, counts[present], adoption_rates[present], mean_beliefs[present]],
+                names='nid,population,adoption_rate,mean_belief',
+            )
+
             neighborhood_stats = []
-            for nid in range(town.neighborhoods):
-                n_mask = day_data['neighborhood_id'] == nid
-                n_data = day_data[n_mask]
-                
-                if len(n_data) == 0:
-                    continue
-                
-                beliefs = n_data[claim_col].values
-                adopted = (beliefs >= adoption_threshold).sum()
-                adoption_rate = adopted / len(n_data)
-                mean_belief = beliefs.mean()
-                
+            for nid, population, adoption_rate, mean_belief in rec.tolist():
                 info = neighborhood_info[nid]
                 neighborhood_stats.append({
                     'neighborhood': info['name'],
                     'nid': nid,
-                    'population': len(n_data),
+                    'population': population,
                     'adoption_rate': adoption_rate,
                     'mean_belief': mean_belief,
                     'edu': info['edu'],
                     'income': info['income']
                 })
-                
+
                 print(f"{info['name']:<25} {info['edu']:<8.2f} ${int(info['income']):<11} {adoption_rate:<12.4f} {mean_belief:<15.4f}")
             
             # Summary statistics
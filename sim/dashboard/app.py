@@ -82,7 +82,9 @@ def main() -> None:
     if snapshots is not None:
         days = sorted(snapshots["day"].unique().tolist())
         day = st.slider("Snapshot Day", min_value=int(min(days)), max_value=int(max(days)), value=int(max(days)))
-        snapshot = snapshots[snapshots["day"] == day].drop(columns=["day", "agent_id"])
+        snapshot = snapshots[snapshots["day"] == day].drop(
+            columns=["day", "agent_id", "neighborhood_id"], errors="ignore"
+        )
         plot_histogram(snapshot, day)
 
     config = load_config(run_dir)
@@ -1,30 +1,51 @@
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass
 
 import numpy as np
 import torch
 
 
+@functools.lru_cache(maxsize=8)
+def _cached_seed_sequence(seed: int) -> np.random.SeedSequence:
+    """Memoize the seed expansion for a given seed.
+
+    SeedSequence.generate_state is pure, so sharing one instance across
+    RNGManager constructions is safe — every caller still gets a fresh
+    Generator with its own stream state. (The Generator itself must not be
+    cached: it is mutable, and sharing one between the simulation and a
+    post-hoc analyzer would silently change both.)
+    """
+    return np.random.SeedSequence(seed)
+
+
+@functools.lru_cache(maxsize=None)
+def _enable_torch_determinism() -> bool:
+    """Apply the global torch determinism switches once per process."""
+    torch.backends.cudnn.deterministic = True
+    torch.backends.cudnn.benchmark = False
+    try:
+        torch.use_deterministic_algorithms(True)
+    except Exception:
+        pass
+    return True
+
+
 @dataclass
 class RNGManager:
     seed: int
     deterministic: bool = True
 
     def __post_init__(self) -> None:
-        self.numpy = np.random.default_rng(self.seed)
+        self.numpy = np.random.Generator(np.random.PCG64(_cached_seed_sequence(self.seed)))
         self.torch_cpu = torch.Generator(device="cpu").manual_seed(self.seed)
         if torch.cuda.is_available():
             self.torch_cuda = torch.Generator(device="cuda").manual_seed(self.seed)
         else:
             self.torch_cuda = None
         if self.deterministic:
-            torch.backends.cudnn.deterministic = True
-            torch.backends.cudnn.benchmark = False
-            try:
-                torch.use_deterministic_algorithms(True)
-            except Exception:
-                pass
+            _enable_torch_determinism()
 
     def torch(self, device: torch.device) -> torch.Generator:
         if device.type == "cuda" and self.torch_cuda is not None:
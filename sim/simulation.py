@@ -243,22 +243,31 @@ def run_simulation(cfg: SimulationConfig, out_dir: str | Path) -> SimulationOutp
             torch.backends.cuda.matmul.allow_tf32 = True
             torch.backends.cudnn.allow_tf32 = True
 
+    # Pre-build the post-intervention world config once; copying the pydantic
+    # model every day after the intervention fires is pure overhead since the
+    # adjustment is the same for all post-intervention days.
+    intervention_day = cfg.world.intervention_day
+    world_post = None
+    if intervention_day is not None:
+        world_post = cfg.world.model_copy()
+        if cfg.world.intervention_type == "moderation":
+            world_post.moderation_strictness = min(
+                1.0, cfg.world.moderation_strictness * (1 + cfg.world.intervention_strength)
+            )
+        elif cfg.world.intervention_type == "debunk":
+            world_post.debunk_intensity = min(
+                1.0, cfg.world.debunk_intensity * (1 + cfg.world.intervention_strength)
+            )
+
     prev_grad = torch.is_grad_enabled()
     torch.set_grad_enabled(False)
     for day in range(cfg.sim.n_steps):
         strains = mutate_strains(strains, rng_manager.numpy)
 
-        world_effective = cfg.world
-        if cfg.world.intervention_day is not None and day >= cfg.world.intervention_day:
-            world_effective = cfg.world.model_copy()
-            if cfg.world.intervention_type == "moderation":
-                world_effective.moderation_strictness = min(
-                    1.0, cfg.world.moderation_strictness * (1 + cfg.world.intervention_strength)
-                )
-            elif cfg.world.intervention_type == "debunk":
-                world_effective.debunk_intensity = min(
-                    1.0, cfg.world.debunk_intensity * (1 + cfg.world.intervention_strength)
-                )
+        if intervention_day is not None and day >= intervention_day:
+            world_effective = world_post
+        else:
+            world_effective = cfg.world
 
         # Apply sharing fatigue (restrained state)
         # Reducing share probability for agents who have shared too much
@@ -272,8 +281,11 @@ def run_simulation(cfg: SimulationConfig, out_dir: str | Path) -> SimulationOutp
         # Negative sharing also fatigues but perhaps slower
         share_probs_neg = share_probs_neg * (0.5 + 0.5 * restrained_penalty)
 
+        # The share tensors are fresh copies from the fatigue scaling above,
+        # so moderation can mutate them in place.
         share_probs_pos, share_probs_neg, warnings = apply_moderation(
-            share_probs_pos, share_probs_neg, strains, world_effective, cfg.moderation
+            share_probs_pos, share_probs_neg, strains, world_effective, cfg.moderation,
+            inplace=True,
         )
 
         shares_pos = torch.bernoulli(share_probs_pos, generator=rng_manager.torch(device))
@@ -418,6 +430,9 @@ def run_simulation(cfg: SimulationConfig, out_dir: str | Path) -> SimulationOutp
             belief_cpu = beliefs.detach().cpu().numpy()
             frame = pd.DataFrame(belief_cpu, columns=[f"claim_{i}" for i in range(n_claims)])
             frame.insert(0, "agent_id", np.arange(n_agents))
+            # Persist the neighborhood assignment so downstream analyzers can
+            # group by neighborhood without regenerating the town.
+            frame.insert(1, "neighborhood_id", town.neighborhood_ids.astype(np.int16))
             collect_snapshot(snapshots, day, frame)
 
         if cfg.metrics.use_gpu_metrics:
@@ -434,7 +449,11 @@ def run_simulation(cfg: SimulationConfig, out_dir: str | Path) -> SimulationOutp
         else:
             belief_cpu = beliefs.detach().cpu().numpy()
             prev_cpu = prev_beliefs.detach().cpu().numpy()
-            trust_cpu = {k: v.detach().cpu().numpy() for k, v in trust.items()}
+            # Stack trust tensors so the device->host copy is a single transfer
+            # instead of one synchronous transfer per trust dimension.
+            trust_keys = list(trust)
+            trust_host = torch.stack([trust[k] for k in trust_keys]).detach().cpu().numpy()
+            trust_cpu = {k: trust_host[i] for i, k in enumerate(trust_keys)}
             daily_metrics, prev_new_adopters_cpu = compute_daily_metrics(
                 day,
                 belief_cpu,
@@ -487,7 +506,11 @@ def run_simulation(cfg: SimulationConfig, out_dir: str | Path) -> SimulationOutp
             if available_days:
                 plot_day = min(available_days, key=lambda x: abs(x - target_day))
                 day_snapshot = snapshots_df[snapshots_df["day"] == plot_day]
-                plot_belief_histogram(day_snapshot.drop(columns=["day", "agent_id"]), plots_dir, plot_day)
+                plot_belief_histogram(
+                    day_snapshot.drop(columns=["day", "agent_id", "neighborhood_id"]),
+                    plots_dir,
+                    plot_day,
+                )
                 
                 # Get demographic data
                 ages = pd.Series(town.demographics.age)
@@ -523,6 +546,14 @@ def run_simulation(cfg: SimulationConfig, out_dir: str | Path) -> SimulationOutp
                         logging.warning(f"Failed to plot adoption by ethnicity: {e}")
 
     metrics_df.to_csv(out_dir / "daily_metrics.csv", index=False)
+    # Minimal town metadata so post-hoc analyzers never have to regenerate
+    # the town (demographics, traits, networks) just to recover assignments.
+    np.savez(
+        out_dir / "town_meta.npz",
+        neighborhood_ids=town.neighborhood_ids.astype(np.int16),
+        neighborhood_coords=town.neighborhood_coords,
+        n_neighborhoods=np.int32(town.neighborhoods),
+    )
     if cfg.output.save_snapshots and not snapshots_df.empty:
         try:
             snapshots_df.to_parquet(out_dir / "belief_snapshots.parquet", index=False)
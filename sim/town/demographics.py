@@ -7,38 +7,188 @@ import numpy as np
 
 from sim.config import TraitConfig, TownConfig, WorldConfig
 
+try:  # Optional JIT-fused kernels when numba is installed (the "numba" extra)
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _ideology_kernel(cons, num, conf, outgroups, church, nat, out):  # pragma: no cover
+        for i in prange(cons.shape[0]):
+            v = (
+                0.2 * cons[i]
+                + 0.2 * (1.0 - num[i])
+                + 0.15 * conf[i]
+                + 0.15 * (1.0 - outgroups[i])
+                + 0.15 * church[i]
+                + 0.15 * (1.0 - nat[i])
+            )
+            out[i] = 0.0 if v < 0.0 else (1.0 if v > 1.0 else v)
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _trait_effects_kernel(  # pragma: no cover
+        skepticism, numeracy, conspiratorial, conformity, edu_norm, income_norm
+    ):
+        # Fused neighborhood education/income effects + clip in one pass per
+        # agent; cache=True persists the compiled kernel across processes.
+        for i in prange(skepticism.shape[0]):
+            e = edu_norm[i]
+            s = skepticism[i] + 0.25 * e
+            n = numeracy[i] + 0.3 * e
+            c = conspiratorial[i] - 0.25 * e
+            f = conformity[i] - 0.2 * (income_norm[i] - 0.5)
+            skepticism[i] = 0.0 if s < 0.0 else (1.0 if s > 1.0 else s)
+            numeracy[i] = 0.0 if n < 0.0 else (1.0 if n > 1.0 else n)
+            conspiratorial[i] = 0.0 if c < 0.0 else (1.0 if c > 1.0 else c)
+            conformity[i] = 0.0 if f < 0.0 else (1.0 if f > 1.0 else f)
+
+except ImportError:
+    _ideology_kernel = None
+    _trait_effects_kernel = None
+
+
+# Ethnicity codebook: agents carry int8 codes indexing into this array, and
+# the string labels are materialized only where needed (plots, reports).
+ETHNICITY_LABELS = np.array(["white", "hispanic", "black", "asian", "other"])
+_ETH_CODES = {label: code for code, label in enumerate(ETHNICITY_LABELS)}
+
+# Cultural group for each ethnicity code, aligned with ETHNICITY_LABELS
+# (asian and other share group 3).
+ETH_TO_GROUP = np.array([0, 1, 2, 3, 3], dtype=np.int8)
+
 
 @dataclass
 class Demographics:
     age: np.ndarray
     education_level: np.ndarray
     occupation: np.ndarray
-    ethnicity: np.ndarray | None = None  # Ethnicity labels: 'white', 'hispanic', 'black', 'asian', 'other'
+    ethnicity_codes: np.ndarray | None = None  # int8 indices into ETHNICITY_LABELS
+
+    @property
+    def ethnicity(self) -> np.ndarray | None:
+        """Ethnicity labels materialized on demand from the int8 codes."""
+        if self.ethnicity_codes is None:
+            return None
+        return ETHNICITY_LABELS[self.ethnicity_codes]
+
+
+# Column layout for the consolidated trait/trust matrices. Keeping every
+# scalar trait in one contiguous (N, K) float32 block improves cache locality
+# and lets downstream code treat the whole trait set as a single array.
+TRAIT_COLS = {
+    "skepticism": 0,
+    "need_for_closure": 1,
+    "conspiratorial_tendency": 2,
+    "numeracy": 3,
+    "conformity": 4,
+    "status_seeking": 5,
+    "prosociality": 6,
+    "conflict_tolerance": 7,
+    "credibility": 8,
+}
+
+TRUST_COLS = {
+    "trust_gov": 0,
+    "trust_church": 1,
+    "trust_local_news": 2,
+    "trust_national_news": 3,
+    "trust_friends": 4,
+    "trust_outgroups": 5,
+}
+
+# Per-column weights (TRUST_COLS order) for the neighborhood income and
+# education effects applied in generate_trust.
+_TRUST_INCOME_W = np.array([1.0, 0.0, 0.8, 0.8, 0.0, 0.0], dtype=np.float32)
+_TRUST_EDU_W = np.array([0.0, -0.15, 0.1, 0.1, 0.0, 0.0], dtype=np.float32)
+
+# Ideology blend expressed over the trait/trust matrices (TRAIT_COLS /
+# TRUST_COLS column order); the bias absorbs the constant part of the
+# 0.2*(1-numeracy), 0.15*(1-outgroups) and 0.15*(1-national_news) terms.
+_IDEOLOGY_TRAIT_W = np.array([0.0, 0.0, 0.2, -0.2, 0.15, 0.0, 0.0, 0.0, 0.0], dtype=np.float32)
+_IDEOLOGY_TRUST_W = np.array([0.0, 0.15, 0.0, -0.15, 0.0, -0.15], dtype=np.float32)
+_IDEOLOGY_BIAS = np.float32(0.5)
 
 
-@dataclass
 class Traits:
-    personality: np.ndarray
-    skepticism: np.ndarray
-    need_for_closure: np.ndarray
-    conspiratorial_tendency: np.ndarray
-    numeracy: np.ndarray
-    conformity: np.ndarray
-    status_seeking: np.ndarray
-    prosociality: np.ndarray
-    conflict_tolerance: np.ndarray
-    emotions: Dict[str, np.ndarray]
-    credibility: np.ndarray
+    """Agent traits backed by a single (N, 9) float32 matrix (see TRAIT_COLS).
+
+    The named accessors return column views into the shared matrix, so the
+    attribute API is unchanged while storage stays one contiguous allocation.
+    """
+
+    __slots__ = ("personality", "matrix", "emotions")
+
+    def __init__(self, personality: np.ndarray, matrix: np.ndarray, emotions: Dict[str, np.ndarray]):
+        self.personality = personality
+        self.matrix = matrix
+        self.emotions = emotions
+
+    @property
+    def skepticism(self) -> np.ndarray:
+        return self.matrix[:, TRAIT_COLS["skepticism"]]
+
+    @property
+    def need_for_closure(self) -> np.ndarray:
+        return self.matrix[:, TRAIT_COLS["need_for_closure"]]
+
+    @property
+    def conspiratorial_tendency(self) -> np.ndarray:
+        return self.matrix[:, TRAIT_COLS["conspiratorial_tendency"]]
+
+    @property
+    def numeracy(self) -> np.ndarray:
+        return self.matrix[:, TRAIT_COLS["numeracy"]]
+
+    @property
+    def conformity(self) -> np.ndarray:
+        return self.matrix[:, TRAIT_COLS["conformity"]]
+
+    @property
+    def status_seeking(self) -> np.ndarray:
+        return self.matrix[:, TRAIT_COLS["status_seeking"]]
+
+    @property
+    def prosociality(self) -> np.ndarray:
+        return self.matrix[:, TRAIT_COLS["prosociality"]]
+
+    @property
+    def conflict_tolerance(self) -> np.ndarray:
+        return self.matrix[:, TRAIT_COLS["conflict_tolerance"]]
+
+    @property
+    def credibility(self) -> np.ndarray:
+        return self.matrix[:, TRAIT_COLS["credibility"]]
 
 
-@dataclass
 class Trust:
-    trust_gov: np.ndarray
-    trust_church: np.ndarray
-    trust_local_news: np.ndarray
-    trust_national_news: np.ndarray
-    trust_friends: np.ndarray
-    trust_outgroups: np.ndarray
+    """Institutional trust backed by a single (N, 6) float32 matrix (TRUST_COLS)."""
+
+    __slots__ = ("matrix",)
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = matrix
+
+    @property
+    def trust_gov(self) -> np.ndarray:
+        return self.matrix[:, TRUST_COLS["trust_gov"]]
+
+    @property
+    def trust_church(self) -> np.ndarray:
+        return self.matrix[:, TRUST_COLS["trust_church"]]
+
+    @property
+    def trust_local_news(self) -> np.ndarray:
+        return self.matrix[:, TRUST_COLS["trust_local_news"]]
+
+    @property
+    def trust_national_news(self) -> np.ndarray:
+        return self.matrix[:, TRUST_COLS["trust_national_news"]]
+
+    @property
+    def trust_friends(self) -> np.ndarray:
+        return self.matrix[:, TRUST_COLS["trust_friends"]]
+
+    @property
+    def trust_outgroups(self) -> np.ndarray:
+        return self.matrix[:, TRUST_COLS["trust_outgroups"]]
 
 
 @dataclass
@@ -47,8 +197,83 @@ class MediaDiet:
     weights: np.ndarray
 
 
-def _beta(rng: np.random.Generator, alpha: float, beta: float, size: int) -> np.ndarray:
-    return rng.beta(alpha, beta, size=size).astype(np.float32)
+def _beta(
+    rng: np.random.Generator,
+    alpha: float,
+    beta: float,
+    size: int | tuple,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Draw Beta(alpha, beta) samples in float32 via the Gamma ratio X/(X+Y).
+
+    Sampling the two Gamma streams directly in float32 avoids the float64
+    intermediate (and downcast copy) that rng.beta would produce; when ``out``
+    is given the result lands in that buffer, otherwise the X buffer is reused.
+    """
+    x = rng.standard_gamma(alpha, size=size, dtype=np.float32)
+    y = rng.standard_gamma(beta, size=size, dtype=np.float32)
+    y += x
+    return np.divide(x, y, out=(out if out is not None else x))
+
+
+def _neighborhood_lut(values: np.ndarray, neighborhood_ids: np.ndarray) -> np.ndarray:
+    """Expand a dense per-neighborhood lookup table to a per-agent float32 array.
+
+    ``values`` is indexed by neighborhood id; neighborhoods without an entry
+    hold NaN so callers can neutralize their effect (e.g. via
+    ``np.nan_to_num``) instead of masking per neighborhood.
+    """
+    return values[neighborhood_ids]
+
+
+def precompute_neighborhood_features(
+    neighborhood_ids: np.ndarray,
+    neighborhood_education: np.ndarray | None,
+    neighborhood_income: np.ndarray | None,
+) -> tuple[np.ndarray | None, np.ndarray | None]:
+    """Normalize neighborhood education/income to per-agent float32 arrays.
+
+    Education maps the 0.3 (low) to 0.8 (high) college rate onto [-1, +1];
+    income maps the rough 30k-110k range onto [0, 1]. Missing entries land on
+    the neutral value (0.0 / 0.5) so they carry no effect downstream. Computed
+    once per town and shared by generate_traits and generate_trust.
+    """
+    edu_norm = None
+    income_norm = None
+    if neighborhood_education is not None:
+        edu_norm = (_neighborhood_lut(neighborhood_education, neighborhood_ids) - 0.3) / 0.5
+        edu_norm = np.nan_to_num(edu_norm, nan=0.0)
+    if neighborhood_income is not None:
+        income_norm = (_neighborhood_lut(neighborhood_income, neighborhood_ids) - 30000) / 80000
+        income_norm = np.clip(income_norm, 0.0, 1.0)
+        income_norm = np.nan_to_num(income_norm, nan=0.5)
+    return edu_norm, income_norm
+
+
+def _apply_neighborhood_effects_numpy(
+    skepticism: np.ndarray,
+    numeracy: np.ndarray,
+    conspiratorial_tendency: np.ndarray,
+    conformity: np.ndarray,
+    edu_norm: np.ndarray | None,
+    income_norm: np.ndarray | None,
+) -> None:
+    """NumPy fallback for the fused numba trait-effects kernel (mutates in place)."""
+    if edu_norm is not None:
+        # Higher education → higher skepticism and numeracy, lower conspiratorial tendency
+        # Based on Pennycook & Rand (2021): education-belief correlation of -0.25
+        # Stronger effects to match literature: -0.25 correlation means high-edu have ~25% lower belief
+        skepticism += 0.25 * edu_norm
+        numeracy += 0.3 * edu_norm
+        conspiratorial_tendency -= 0.25 * edu_norm
+        np.clip(skepticism, 0.0, 1.0, out=skepticism)
+        np.clip(numeracy, 0.0, 1.0, out=numeracy)
+        np.clip(conspiratorial_tendency, 0.0, 1.0, out=conspiratorial_tendency)
+
+    if income_norm is not None:
+        # Higher income → lower conformity (more independent thinking)
+        conformity -= 0.2 * (income_norm - 0.5)
+        np.clip(conformity, 0.0, 1.0, out=conformity)
 
 
 def generate_demographics(
@@ -56,20 +281,29 @@ def generate_demographics(
     n_agents: int,
     town: TownConfig,
 ) -> Demographics:
-    children = int(n_agents * town.children_fraction)
-    seniors = int(n_agents * town.senior_fraction)
-    adults = n_agents - children - seniors
-
-    ages = np.concatenate([
-        rng.integers(0, 18, size=children),
-        rng.integers(18, 65, size=adults),
-        rng.integers(65, town.max_age + 1, size=seniors),
-    ])
-    rng.shuffle(ages)
+    # Branchless inverse-CDF assignment: one uniform draw picks each agent's
+    # age bucket, a second picks the age within it. Output is already in
+    # random order, so no concatenate + shuffle passes are needed.
+    u, r = rng.random((2, n_agents), dtype=np.float32)
+    is_child = u < town.children_fraction
+    is_senior = u >= 1.0 - town.senior_fraction
+    ages = np.where(
+        is_child,
+        (r * 18).astype(np.int32),
+        np.where(
+            is_senior,
+            65 + (r * (town.max_age + 1 - 65)).astype(np.int32),
+            18 + (r * (65 - 18)).astype(np.int32),
+        ),
+    )
 
-    education_levels = rng.integers(0, len(town.education_levels), size=n_agents)
-    occupation = rng.integers(0, len(town.occupation_types), size=n_agents)
-    return Demographics(age=ages.astype(np.int32), education_level=education_levels, occupation=occupation)
+    # Tiny cardinalities: int8 codes cut memory/bandwidth 8x vs default int64,
+    # and ages fit int16 for any sane max_age.
+    education_levels = rng.integers(0, len(town.education_levels), size=n_agents, dtype=np.int8)
+    occupation = rng.integers(0, len(town.occupation_types), size=n_agents, dtype=np.int8)
+    return Demographics(
+        age=ages.astype(np.int16), education_level=education_levels, occupation=occupation
+    )
 
 
 def generate_traits(
@@ -78,144 +312,108 @@ def generate_traits(
     traits: TraitConfig,
     emotions_enabled: bool,
     ages: Optional[np.ndarray] = None,
-    neighborhood_ids: Optional[np.ndarray] = None,
-    neighborhood_education: Optional[Dict[int, float]] = None,
-    neighborhood_income: Optional[Dict[int, float]] = None,
+    edu_norm: Optional[np.ndarray] = None,
+    income_norm: Optional[np.ndarray] = None,
 ) -> Traits:
-    personality = np.stack([
-        _beta(rng, traits.personality.alpha, traits.personality.beta, n_agents)
-        for _ in range(5)
-    ], axis=1)
-
-    # Base trait generation
-    skepticism_base = _beta(rng, traits.cognitive.alpha, traits.cognitive.beta, n_agents)
-    need_for_closure = _beta(rng, traits.cognitive.alpha, traits.cognitive.beta, n_agents)
-    conspiratorial_tendency = _beta(rng, traits.cognitive.alpha, traits.cognitive.beta, n_agents)
-    numeracy_base = _beta(rng, traits.cognitive.alpha, traits.cognitive.beta, n_agents)
-
-    conformity_base = _beta(rng, traits.social.alpha, traits.social.beta, n_agents)
-    status_seeking = _beta(rng, traits.social.alpha, traits.social.beta, n_agents)
-    prosociality = _beta(rng, traits.social.alpha, traits.social.beta, n_agents)
-    conflict_tolerance = _beta(rng, traits.social.alpha, traits.social.beta, n_agents)
-    
-    # Apply neighborhood-specific adjustments if available
-    skepticism = skepticism_base.copy()
-    numeracy = numeracy_base.copy()
-    conformity = conformity_base.copy()
-    
-    if neighborhood_ids is not None and neighborhood_education is not None:
-        # Higher education → higher skepticism and numeracy, lower conspiratorial tendency
-        # Based on Pennycook & Rand (2021): education-belief correlation of -0.25
-        for nid, edu_rate in neighborhood_education.items():
-            mask = neighborhood_ids == nid
-            if mask.any():
-                # Education effect: stronger effect to achieve -0.25 correlation
-                # Normalize education rate to [-1, 1] scale
-                edu_normalized = (edu_rate - 0.3) / 0.5  # 0.3 (low) to 0.8 (high) -> -1 to +1
-                # Stronger effects to match literature: -0.25 correlation means high-edu have ~25% lower belief
-                skepticism[mask] = np.clip(skepticism[mask] + 0.25 * edu_normalized, 0.0, 1.0)
-                numeracy[mask] = np.clip(numeracy[mask] + 0.3 * edu_normalized, 0.0, 1.0)
-                conspiratorial_tendency[mask] = np.clip(conspiratorial_tendency[mask] - 0.25 * edu_normalized, 0.0, 1.0)
-    
-    if neighborhood_ids is not None and neighborhood_income is not None:
-        # Higher income → lower conformity (more independent thinking)
-        for nid, income in neighborhood_income.items():
-            mask = neighborhood_ids == nid
-            if mask.any():
-                # Income effect: normalize income (e.g., 30k-110k range) and adjust conformity
-                income_normalized = (income - 30000) / 80000  # Rough normalization
-                income_normalized = np.clip(income_normalized, 0.0, 1.0)
-                conformity[mask] = np.clip(conformity[mask] - 0.2 * (income_normalized - 0.5), 0.0, 1.0)
+    # Personality is drawn straight into its final (N, 5) C-contiguous layout
+    personality = np.empty((n_agents, 5), dtype=np.float32)
+    _beta(rng, traits.personality.alpha, traits.personality.beta, (n_agents, 5), out=personality)
+
+    # Base trait generation: one batched draw per trait family instead of one
+    # RNG dispatch per trait, all staying in float32.
+    cognitive = _beta(rng, traits.cognitive.alpha, traits.cognitive.beta, (4, n_agents))
+    skepticism, need_for_closure, conspiratorial_tendency, numeracy = cognitive
+
+    social = _beta(rng, traits.social.alpha, traits.social.beta, (4, n_agents))
+    conformity, status_seeking, prosociality, conflict_tolerance = social
+
+    # Apply neighborhood-specific adjustments (in place on the base draws —
+    # the unadjusted values are not needed anywhere else). The normalized
+    # per-agent features come from precompute_neighborhood_features.
+    if _trait_effects_kernel is not None and edu_norm is not None and income_norm is not None:
+        # Single fused pass over all four adjusted traits when numba is present
+        _trait_effects_kernel(
+            skepticism, numeracy, conspiratorial_tendency, conformity, edu_norm, income_norm
+        )
+    elif edu_norm is not None or income_norm is not None:
+        _apply_neighborhood_effects_numpy(
+            skepticism, numeracy, conspiratorial_tendency, conformity, edu_norm, income_norm
+        )
 
     emotions = {}
     if emotions_enabled:
-        emotions = {
-            "fear": _beta(rng, traits.emotion.alpha, traits.emotion.beta, n_agents),
-            "anger": _beta(rng, traits.emotion.alpha, traits.emotion.beta, n_agents),
-            "hope": _beta(rng, traits.emotion.alpha, traits.emotion.beta, n_agents),
-        }
+        emotion_draws = _beta(rng, traits.emotion.alpha, traits.emotion.beta, (3, n_agents))
+        emotions = dict(zip(("fear", "anger", "hope"), emotion_draws))
     # Compute age-based credibility factor (0..1). If ages provided, scale credibility by age.
     if ages is not None:
         # Relative credibility: map each agent's age to its percentile rank in the population
         # so credibility is higher for agents older than their peers and lower for younger agents.
         ages_arr = ages.astype(np.float32)
-        # ranks: 0..n-1 where larger means older relative to others
-        ranks = np.argsort(np.argsort(ages_arr))
+        # ranks: 0..n-1 where larger means older relative to others.
+        # One sort + scatter instead of the double-argsort rank idiom.
+        order = np.argsort(ages_arr, kind="stable")
+        ranks = np.empty(len(order), dtype=np.int32)
+        ranks[order] = np.arange(len(order), dtype=np.int32)
         denom = max(1, len(ranks) - 1)
         norm_rank = ranks.astype(np.float32) / float(denom)
-        credibility = 0.2 + 0.75 * norm_rank
-        credibility = np.clip(credibility, 0.2, 0.95).astype(np.float32)
+        credibility = np.empty_like(norm_rank)
+        np.clip(0.2 + 0.75 * norm_rank, 0.2, 0.95, out=credibility)
     else:
         # fallback: sample credibility from Beta distribution centered around 0.6
         credibility = _beta(rng, 2.0, 1.5, n_agents)
 
-    return Traits(
-        personality=personality,
-        skepticism=skepticism,
-        need_for_closure=need_for_closure,
-        conspiratorial_tendency=conspiratorial_tendency,
-        numeracy=numeracy,
-        conformity=conformity,
-        status_seeking=status_seeking,
-        prosociality=prosociality,
-        conflict_tolerance=conflict_tolerance,
-        emotions=emotions,
-        credibility=credibility,
-    )
+    matrix = np.empty((n_agents, len(TRAIT_COLS)), dtype=np.float32)
+    matrix[:, TRAIT_COLS["skepticism"]] = skepticism
+    matrix[:, TRAIT_COLS["need_for_closure"]] = need_for_closure
+    matrix[:, TRAIT_COLS["conspiratorial_tendency"]] = conspiratorial_tendency
+    matrix[:, TRAIT_COLS["numeracy"]] = numeracy
+    matrix[:, TRAIT_COLS["conformity"]] = conformity
+    matrix[:, TRAIT_COLS["status_seeking"]] = status_seeking
+    matrix[:, TRAIT_COLS["prosociality"]] = prosociality
+    matrix[:, TRAIT_COLS["conflict_tolerance"]] = conflict_tolerance
+    matrix[:, TRAIT_COLS["credibility"]] = credibility
+    return Traits(personality=personality, matrix=matrix, emotions=emotions)
 
 
 def generate_trust(
     rng: np.random.Generator,
     n_agents: int,
     world: WorldConfig,
-    neighborhood_ids: Optional[np.ndarray] = None,
-    neighborhood_income: Optional[Dict[int, float]] = None,
-    neighborhood_education: Optional[Dict[int, float]] = None,
+    income_norm: Optional[np.ndarray] = None,
+    edu_norm: Optional[np.ndarray] = None,
 ) -> Trust:
-    def jitter(base: float, size: int) -> np.ndarray:
-        vals = rng.normal(loc=base, scale=world.trust_variance, size=size)
-        return np.clip(vals, 0.0, 1.0).astype(np.float32)
-    
-    # Base trust values with jitter
-    trust_gov = jitter(world.trust_baselines["gov"], n_agents)
-    trust_church = jitter(world.trust_baselines["church"], n_agents)
-    trust_local_news = jitter(world.trust_baselines["local_news"], n_agents)
-    trust_national_news = jitter(world.trust_baselines["national_news"], n_agents)
-    trust_friends = jitter(world.trust_baselines["friends"], n_agents)
-    trust_outgroups = jitter(world.trust_baselines["outgroups"], n_agents)
-    
-    # Apply neighborhood-specific adjustments if available
-    if neighborhood_ids is not None:
-        if neighborhood_income is not None:
+    # Base trust values with jitter: one batched draw for all six dimensions,
+    # shifted by the per-dimension baselines and clipped in place. The key
+    # order matches the TRUST_COLS column layout.
+    bases = np.array(
+        [
+            world.trust_baselines[k]
+            for k in ("gov", "church", "local_news", "national_news", "friends", "outgroups")
+        ],
+        dtype=np.float32,
+    )
+    matrix = rng.standard_normal(size=(n_agents, len(TRUST_COLS)), dtype=np.float32)
+    matrix *= world.trust_variance
+    matrix += bases[None, :]
+    np.clip(matrix, 0.0, 1.0, out=matrix)
+
+    # Apply neighborhood-specific adjustments if available (per-agent features
+    # from precompute_neighborhood_features). Each effect is one broadcasted
+    # outer product over the whole (N, 6) matrix instead of per-column ops.
+    if income_norm is not None or edu_norm is not None:
+        if income_norm is not None:
             # Higher income → higher trust in institutions (gov, media)
-            for nid, income in neighborhood_income.items():
-                mask = neighborhood_ids == nid
-                if mask.any():
-                    income_normalized = (income - 30000) / 80000
-                    income_normalized = np.clip(income_normalized, 0.0, 1.0)
-                    income_effect = (income_normalized - 0.5) * 0.25  # ±0.125 max effect
-                    trust_gov[mask] = np.clip(trust_gov[mask] + income_effect, 0.0, 1.0)
-                    trust_local_news[mask] = np.clip(trust_local_news[mask] + income_effect * 0.8, 0.0, 1.0)
-                    trust_national_news[mask] = np.clip(trust_national_news[mask] + income_effect * 0.8, 0.0, 1.0)
-        
-        if neighborhood_education is not None:
+            income_effect = (income_norm - 0.5) * 0.25  # ±0.125 max effect
+            matrix += income_effect[:, None] * _TRUST_INCOME_W[None, :]
+
+        if edu_norm is not None:
             # Higher education → higher trust in media, lower trust in church
-            for nid, edu_rate in neighborhood_education.items():
-                mask = neighborhood_ids == nid
-                if mask.any():
-                    edu_effect = (edu_rate - 0.3) / 0.5  # Normalize: -1 to +1
-                    trust_local_news[mask] = np.clip(trust_local_news[mask] + 0.1 * edu_effect, 0.0, 1.0)
-                    trust_national_news[mask] = np.clip(trust_national_news[mask] + 0.1 * edu_effect, 0.0, 1.0)
-                    trust_church[mask] = np.clip(trust_church[mask] - 0.15 * edu_effect, 0.0, 1.0)
-
-    return Trust(
-        trust_gov=trust_gov,
-        trust_church=trust_church,
-        trust_local_news=trust_local_news,
-        trust_national_news=trust_national_news,
-        trust_friends=trust_friends,
-        trust_outgroups=trust_outgroups,
-    )
+            matrix += edu_norm[:, None] * _TRUST_EDU_W[None, :]
+
+        # Single closing clip over the whole matrix covers every adjusted column
+        np.clip(matrix, 0.0, 1.0, out=matrix)
+
+    return Trust(matrix)
 
 
 def generate_media_diet(
@@ -226,7 +424,9 @@ def generate_media_diet(
     ethnicity: np.ndarray | None = None,
 ) -> MediaDiet:
     """Generate per-agent media channel weights with demographic biases.
-    
+
+    ``ethnicity`` is the int8 code array (see ETHNICITY_LABELS).
+
     Biases (Pew Research findings):
     - Young (18-34): High TikTok/Instagram, low TV/Local News.
     - Seniors (65+): High TV/Local News, low TikTok.
@@ -258,57 +458,70 @@ def generate_media_diet(
             base_channels = ["local_social", "national_social", "tv", "local_news", "church"]
             base_alphas = [1.5, 1.2, 1.0, 1.3, 0.9]
 
-        weights = np.zeros((n_agents, len(base_channels)), dtype=np.float32)
-        
-        # Apply demographic biases
-        for i in range(n_agents):
-            agent_alphas = list(base_alphas)
-            
-            # Age Bias
-            if ages is not None:
-                age = ages[i]
-                if age < 35:
-                    # Youth: +TikTok, +Instagram, -TV, -Local News
-                    for idx, ch in enumerate(base_channels):
-                        if ch in ("tiktok", "instagram"): agent_alphas[idx] *= 2.0
-                        if ch in ("tv", "local_news"): agent_alphas[idx] *= 0.5
-                elif age >= 65:
-                    # Seniors: +TV, +Local News, --TikTok, -Instagram
-                    for idx, ch in enumerate(base_channels):
-                        if ch in ("tv", "local_news"): agent_alphas[idx] *= 2.0
-                        if ch in ("tiktok"): agent_alphas[idx] *= 0.1
-                        if ch in ("instagram"): agent_alphas[idx] *= 0.4
-            
-            # Ethnicity Bias (Subtle community penetration shifts)
-            if ethnicity is not None:
-                eth = ethnicity[i]
-                if eth == 'hispanic':
-                    # WhatsApp often over-indexes in Hispanic communities (connectivity to international fam)
-                    for idx, ch in enumerate(base_channels):
-                        if ch == "whatsapp": agent_alphas[idx] *= 1.5
-                elif eth == 'black':
-                    # High social media engagement for news
-                    for idx, ch in enumerate(base_channels):
-                        if ch in ("facebook", "tiktok"): agent_alphas[idx] *= 1.3
-            
-            # Stochasticity: unique diet for every agent
-            weights[i] = rng.dirichlet([a + 0.1 for a in agent_alphas])
-            
+        # Vectorized demographic biases: build an (n_agents, C) alpha matrix,
+        # then draw every agent's Dirichlet sample in one batched Gamma pass.
+        alphas = np.broadcast_to(
+            np.asarray(base_alphas, dtype=np.float32), (n_agents, len(base_channels))
+        ).copy()
+
+        # Channel -> column specialization: resolve the configured channel set
+        # to integer column arrays once, so the biasing below is pure integer
+        # indexing with no string comparisons.
+        ch_idx = {ch: i for i, ch in enumerate(base_channels)}
+
+        def _cols(*names: str) -> np.ndarray:
+            return np.array([ch_idx[c] for c in names if c in ch_idx], dtype=np.int32)
+
+        # Age Bias
+        if ages is not None:
+            young = ages < 35
+            senior = ages >= 65
+            # Youth: +TikTok, +Instagram, -TV, -Local News
+            alphas[np.ix_(young, _cols("tiktok", "instagram"))] *= 2.0
+            alphas[np.ix_(young, _cols("tv", "local_news"))] *= 0.5
+            # Seniors: +TV, +Local News, --TikTok, -Instagram
+            alphas[np.ix_(senior, _cols("tv", "local_news"))] *= 2.0
+            alphas[np.ix_(senior, _cols("tiktok"))] *= 0.1
+            alphas[np.ix_(senior, _cols("instagram"))] *= 0.4
+
+        # Ethnicity Bias (Subtle community penetration shifts)
+        if ethnicity is not None:
+            # WhatsApp often over-indexes in Hispanic communities (connectivity to international fam)
+            alphas[np.ix_(ethnicity == _ETH_CODES["hispanic"], _cols("whatsapp"))] *= 1.5
+            # High social media engagement for news
+            alphas[np.ix_(ethnicity == _ETH_CODES["black"], _cols("facebook", "tiktok"))] *= 1.3
+
+        # Stochasticity: unique diet for every agent.
+        # Dirichlet(alpha) == normalized independent Gamma(alpha) draws.
+        alphas += 0.1
+        gamma = rng.standard_gamma(alphas)
+        weights = (gamma / gamma.sum(axis=1, keepdims=True)).astype(np.float32, copy=False)
         return MediaDiet(channels=base_channels, weights=weights)
 
     # fallback default
     channels = ["local_social", "national_social", "tv", "local_news", "church"]
-    weights = rng.dirichlet([1.5, 1.2, 1.0, 1.3, 0.9], size=n_agents).astype(np.float32)
+    weights = rng.dirichlet([1.5, 1.2, 1.0, 1.3, 0.9], size=n_agents).astype(np.float32, copy=False)
     return MediaDiet(channels=channels, weights=weights)
 
 
 def ideology_proxy(traits: Traits, trust: Trust) -> np.ndarray:
-    raw = (
-        0.2 * traits.conspiratorial_tendency
-        + 0.2 * (1 - traits.numeracy)
-        + 0.15 * traits.conformity
-        + 0.15 * (1 - trust.trust_outgroups)
-        + 0.15 * trust.trust_church
-        + 0.15 * (1 - trust.trust_national_news)
-    )
-    return np.clip(raw, 0.0, 1.0).astype(np.float32)
+    out = np.empty(traits.conspiratorial_tendency.shape[0], dtype=np.float32)
+    if _ideology_kernel is not None:
+        # Fused single pass over all six trait/trust streams, no temporaries.
+        _ideology_kernel(
+            traits.conspiratorial_tendency,
+            traits.numeracy,
+            traits.conformity,
+            trust.trust_outgroups,
+            trust.trust_church,
+            trust.trust_national_news,
+            out,
+        )
+        return out
+    # Two SGEMV calls over the consolidated matrices instead of six
+    # scalar-times-array temporaries.
+    np.matmul(traits.matrix, _IDEOLOGY_TRAIT_W, out=out)
+    out += trust.matrix @ _IDEOLOGY_TRUST_W
+    out += _IDEOLOGY_BIAS
+    np.clip(out, 0.0, 1.0, out=out)
+    return out
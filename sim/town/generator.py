@@ -7,6 +7,8 @@ import numpy as np
 
 from sim.config import NetworkConfig, TownConfig, TraitConfig, WorldConfig
 from sim.town.demographics import (
+    ETH_TO_GROUP,
+    ETHNICITY_LABELS,
     Demographics,
     MediaDiet,
     Traits,
@@ -16,9 +18,54 @@ from sim.town.demographics import (
     generate_traits,
     generate_trust,
     ideology_proxy,
+    precompute_neighborhood_features,
 )
 from sim.town.networks import build_networks
 
+try:  # Optional fused sampler when numba is installed (the "numba" extra)
+    from numba import njit, prange
+
+    @njit(parallel=True, cache=True)
+    def _sample_codes_kernel(neighborhood_ids, cdfs, uniforms, out):  # pragma: no cover
+        # One pass over the agents; each neighborhood's small CDF row stays
+        # cache-resident and no (n_agents, K) intermediate is materialized.
+        for i in prange(neighborhood_ids.shape[0]):
+            row = cdfs[neighborhood_ids[i]]
+            u = uniforms[i]
+            code = 0
+            for k in range(row.shape[0]):
+                if row[k] >= u:
+                    code = k
+                    break
+            out[i] = code
+
+except ImportError:
+    _sample_codes_kernel = None
+
+
+def _categorical_by_neighborhood(
+    rng: np.random.Generator,
+    cdf: np.ndarray,
+    neighborhood_ids: np.ndarray,
+    out_dtype: np.dtype,
+) -> np.ndarray:
+    """Draw one category per agent from its neighborhood's CDF row."""
+    u = rng.random(neighborhood_ids.shape[0], dtype=np.float32)
+    if _sample_codes_kernel is not None:
+        out = np.empty(neighborhood_ids.shape[0], dtype=out_dtype)
+        _sample_codes_kernel(neighborhood_ids, cdf, u, out)
+        return out
+    # Single searchsorted over the raveled CDF table: offsetting row i by 2*i
+    # keeps the flattened values strictly increasing, so each query lands in
+    # its own row without materializing an (n_agents, K) boolean matrix.
+    # float64 keeps the offsets exact for towns with many neighborhoods.
+    n_cats = cdf.shape[1]
+    offsets = 2.0 * np.arange(cdf.shape[0], dtype=np.float64)
+    flat = (cdf.astype(np.float64) + offsets[:, None]).ravel()
+    query = u.astype(np.float64) + offsets[neighborhood_ids]
+    idx = np.searchsorted(flat, query, side="left")
+    return (idx - neighborhood_ids * n_cats).astype(out_dtype)
+
 
 @dataclass
 class Town:
@@ -46,15 +93,19 @@ def assign_groups(
 ) -> np.ndarray:
     if std_size is None:
         std_size = mean_size * 0.3
-    sizes = np.maximum(1, rng.normal(loc=mean_size, scale=std_size, size=n_agents).astype(int))
-    group_ids = np.empty(n_agents, dtype=np.int32)
-    gid = 0
-    idx = 0
-    while idx < n_agents:
-        size = int(np.clip(sizes[gid % len(sizes)], 1, n_agents - idx))
-        group_ids[idx : idx + size] = gid
-        gid += 1
-        idx += size
+    # Oversample group sizes, keep the prefix that covers n_agents, and expand
+    # ids with np.repeat instead of a Python slice-assignment loop.
+    est = n_agents // max(1, int(mean_size)) + 16
+    sizes = np.maximum(1, rng.normal(loc=mean_size, scale=std_size, size=est).astype(np.int32))
+    ends = np.cumsum(sizes)
+    while ends[-1] < n_agents:  # rare: oversample again until coverage
+        extra = np.maximum(1, rng.normal(loc=mean_size, scale=std_size, size=est).astype(np.int32))
+        sizes = np.concatenate([sizes, extra])
+        ends = np.cumsum(sizes)
+    n_groups = int(np.searchsorted(ends, n_agents)) + 1
+    sizes = sizes[:n_groups]
+    sizes[-1] -= int(ends[n_groups - 1] - n_agents)  # trim overshoot so sum == n_agents
+    group_ids = np.repeat(np.arange(n_groups, dtype=np.int32), sizes)
     rng.shuffle(group_ids)
     return group_ids
 
@@ -117,120 +168,87 @@ def generate_town(
     demographics = generate_demographics(rng, n_agents, town_cfg)
     ages = demographics.age
     
-    # Assign ethnicity based on neighborhood demographics if available
-    ethnicity = None
-    if getattr(town_cfg, "neighborhood_specs", None) and len(neighborhood_ids) > 0:
-        specs = town_cfg.neighborhood_specs
-        ethnicity_labels = ['white', 'hispanic', 'black', 'asian', 'other']
-        ethnicity = np.empty(n_agents, dtype=object)
-        
-        # Assign ethnicity per neighborhood (vectorized for efficiency)
-        for neighborhood_idx in range(len(specs)):
-            spec = specs[neighborhood_idx]
-            eth_dist = spec.get("demographics", {}).get("ethnicity", {})
-            if eth_dist:
-                # Get agents in this neighborhood
-                neighborhood_mask = neighborhood_ids == neighborhood_idx
-                n_in_neighborhood = neighborhood_mask.sum()
-                
-                if n_in_neighborhood > 0:
-                    # Sample ethnicity based on neighborhood distribution
-                    eth_probs = np.array([eth_dist.get(eth, 0.0) for eth in ethnicity_labels], dtype=np.float32)
-                    # Normalize probabilities
-                    total = eth_probs.sum()
-                    if total > 0:
-                        eth_probs = eth_probs / total
-                        # Sample ethnicity for all agents in this neighborhood at once
-                        sampled_ethnicities = rng.choice(ethnicity_labels, size=n_in_neighborhood, p=eth_probs)
-                        ethnicity[neighborhood_mask] = sampled_ethnicities
-                    else:
-                        ethnicity[neighborhood_mask] = 'white'  # Default
-                else:
-                    # No agents in this neighborhood, skip
-                    pass
-            else:
-                # No ethnicity distribution, assign default
-                neighborhood_mask = neighborhood_ids == neighborhood_idx
-                ethnicity[neighborhood_mask] = 'white'
-        
-        # Fill any remaining agents with default
-        mask = ethnicity == None  # noqa: E711
-        if mask.any():
-            ethnicity[mask] = 'white'
-        
-        # Update demographics with ethnicity
-        demographics.ethnicity = ethnicity
-    else:
-        # Fallback: assign random ethnicity if not provided (to enable demographic plots)
-        ethnicity_labels = ['white', 'hispanic', 'black', 'asian', 'other']
-        # Use a realistic US-like default distribution
-        ethnicity = rng.choice(ethnicity_labels, size=n_agents, p=[0.60, 0.18, 0.12, 0.06, 0.04])
-        demographics.ethnicity = ethnicity
-    
-    # Assign cultural groups based on neighborhood cultural composition
-    cultural_groups = np.zeros(n_agents, dtype=np.int32)
-    if getattr(town_cfg, "neighborhood_specs", None) and len(neighborhood_ids) > 0:
-        specs = town_cfg.neighborhood_specs
-        for neighborhood_idx in range(len(specs)):
-            spec = specs[neighborhood_idx]
-            cultural_comp = spec.get("cultural_composition", [0.25, 0.25, 0.25, 0.25])  # Default equal distribution
-            if cultural_comp and len(cultural_comp) == 4:
-                # Get agents in this neighborhood
-                neighborhood_mask = neighborhood_ids == neighborhood_idx
-                n_in_neighborhood = neighborhood_mask.sum()
-                
-                if n_in_neighborhood > 0:
-                    # Normalize cultural composition probabilities
-                    comp_probs = np.array(cultural_comp, dtype=np.float32)
-                    comp_probs = comp_probs / comp_probs.sum()
-                    
-                    # Sample cultural groups for agents in this neighborhood
-                    sampled_groups = rng.choice(4, size=n_in_neighborhood, p=comp_probs)
-                    cultural_groups[neighborhood_mask] = sampled_groups
-    # If no neighborhood specs or cultural composition not provided, assign based on ethnicity
-    elif ethnicity is not None:
-        # Map ethnicity to cultural groups
-        ethnicity_to_group = {
-            'white': 0,
-            'hispanic': 1, 
-            'black': 2,
-            'asian': 3,
-            'other': 3  # Asian/other combined
-        }
-        for i in range(n_agents):
-            cultural_groups[i] = ethnicity_to_group.get(ethnicity[i], 0)
-    
-    # Extract neighborhood-specific parameters for trait/trust differentiation
+    # Agents carry int8 ethnicity codes into ETHNICITY_LABELS; no object-dtype
+    # arrays.
     neighborhood_education = None
     neighborhood_income = None
     if getattr(town_cfg, "neighborhood_specs", None) and len(neighborhood_ids) > 0:
         specs = town_cfg.neighborhood_specs
-        neighborhood_education = {}
-        neighborhood_income = {}
-        for neighborhood_idx in range(len(specs)):
-            spec = specs[neighborhood_idx]
+        ethnicity_labels = list(ETHNICITY_LABELS)
+
+        # Single pass over the specs builds every per-neighborhood table:
+        # ethnicity distribution, cultural composition, and the dense
+        # education/income lookup tables (NaN for missing entries) consumed by
+        # the trait/trust generators.
+        # Ethnicity rows without a usable distribution default to all-'white',
+        # matching the old per-neighborhood fallback; missing cultural
+        # compositions default to equal mass, malformed ones pin group 0.
+        eth_probs = np.zeros((len(specs), len(ethnicity_labels)), dtype=np.float32)
+        eth_probs[:, 0] = 1.0
+        comp_probs = np.full((len(specs), 4), 0.25, dtype=np.float32)
+        neighborhood_education = np.full(len(specs), np.nan, dtype=np.float32)
+        neighborhood_income = np.full(len(specs), np.nan, dtype=np.float32)
+        for neighborhood_idx, spec in enumerate(specs):
             demos = spec.get("demographics", {})
-            # Extract education rate (college_educated fraction)
+
+            eth_dist = demos.get("ethnicity", {})
+            if eth_dist:
+                row = np.array(
+                    [eth_dist.get(eth, 0.0) for eth in ethnicity_labels], dtype=np.float32
+                )
+                total = row.sum()
+                if total > 0:
+                    eth_probs[neighborhood_idx] = row / total
+
+            cultural_comp = spec.get("cultural_composition", [0.25, 0.25, 0.25, 0.25])
+            if cultural_comp and len(cultural_comp) == 4:
+                row = np.array(cultural_comp, dtype=np.float32)
+                comp_probs[neighborhood_idx] = row / row.sum()
+            else:
+                comp_probs[neighborhood_idx] = [1.0, 0.0, 0.0, 0.0]
+
+            # Education rate (college_educated fraction) and median income
             edu_rate = demos.get("college_educated")
             if edu_rate is not None:
                 neighborhood_education[neighborhood_idx] = float(edu_rate)
-            # Extract median income
             income = demos.get("median_income")
             if income is not None:
                 neighborhood_income[neighborhood_idx] = float(income)
-    
+
+        # One vectorized inverse-CDF draw per category set: gather each
+        # agent's CDF row by neighborhood and resolve with a single uniform.
+        eth_cdf = eth_probs.cumsum(axis=1)
+        eth_cdf[:, -1] = 1.0  # guard against float round-off in the last bucket
+        ethnicity = _categorical_by_neighborhood(rng, eth_cdf, neighborhood_ids, np.int8)
+        demographics.ethnicity_codes = ethnicity
+
+        comp_cdf = comp_probs.cumsum(axis=1)
+        comp_cdf[:, -1] = 1.0
+        cultural_groups = _categorical_by_neighborhood(rng, comp_cdf, neighborhood_ids, np.int32)
+    else:
+        # Fallback: assign random ethnicity if not provided (to enable demographic plots)
+        # Use a realistic US-like default distribution
+        ethnicity = rng.choice(
+            len(ETHNICITY_LABELS), size=n_agents, p=[0.60, 0.18, 0.12, 0.06, 0.04]
+        ).astype(np.int8)
+        demographics.ethnicity_codes = ethnicity
+
+        # Map ethnicity codes to cultural groups via the codebook
+        cultural_groups = np.take(ETH_TO_GROUP, ethnicity).astype(np.int32)
+
+
+    # Normalize the neighborhood features once; both generators share the
+    # same per-agent arrays instead of redoing the gather + normalization.
+    edu_norm, income_norm = precompute_neighborhood_features(
+        neighborhood_ids, neighborhood_education, neighborhood_income
+    )
+
     traits = generate_traits(
         rng, n_agents, trait_cfg, world_cfg.emotions_enabled, ages,
-        neighborhood_ids=neighborhood_ids if getattr(town_cfg, "neighborhood_specs", None) else None,
-        neighborhood_education=neighborhood_education,
-        neighborhood_income=neighborhood_income,
-    )
-    trust = generate_trust(
-        rng, n_agents, world_cfg,
-        neighborhood_ids=neighborhood_ids if getattr(town_cfg, "neighborhood_specs", None) else None,
-        neighborhood_income=neighborhood_income,
-        neighborhood_education=neighborhood_education,
+        edu_norm=edu_norm,
+        income_norm=income_norm,
     )
+    trust = generate_trust(rng, n_agents, world_cfg, income_norm=income_norm, edu_norm=edu_norm)
     # Allow world-level media environment to influence media diet if provided
     media_env = getattr(world_cfg, "media_environment", None)
     media_diet = generate_media_diet(rng, n_agents, media_env, ages=ages, ethnicity=ethnicity)
@@ -55,11 +55,18 @@ def _edge_weight(
     return float(np.clip(weight, 0.05, 3.0))
 
 
-def _group_members(group_ids: np.ndarray) -> Dict[int, np.ndarray]:
-    groups: Dict[int, List[int]] = {}
-    for idx, gid in enumerate(group_ids):
-        groups.setdefault(int(gid), []).append(idx)
-    return {gid: np.array(members, dtype=np.int32) for gid, members in groups.items()}
+def group_indices(ids: np.ndarray, num_groups: int | None = None) -> List[np.ndarray]:
+    """Return per-group agent index arrays (group g at position g).
+
+    One stable argsort + split replaces a boolean-mask scan per group, so the
+    cost is O(n log n) regardless of the group count. Groups with no members
+    yield empty arrays.
+    """
+    if num_groups is None:
+        num_groups = int(ids.max()) + 1
+    order = np.argsort(ids, kind="stable").astype(np.int32)
+    counts = np.bincount(ids, minlength=num_groups)
+    return np.split(order, np.cumsum(counts)[:-1])
 
 
 def _neighborhood_edges(
@@ -73,8 +80,8 @@ def _neighborhood_edges(
 ) -> List[Tuple[int, int, float, str]]:
     edges: List[Tuple[int, int, float, str]] = []
     neighborhoods = int(neighborhood_ids.max()) + 1
-    members_by_neighborhood = {nid: np.where(neighborhood_ids == nid)[0] for nid in range(neighborhoods)}
-    for nid, members in members_by_neighborhood.items():
+    members_by_neighborhood = group_indices(neighborhood_ids, neighborhoods)
+    for members in members_by_neighborhood:
         if len(members) <= 1:
             continue
         k_intra = min(10, max(1, int(cfg.intra_neighborhood_p * len(members))))
@@ -123,19 +130,19 @@ def build_networks(
         for j in range(neighborhoods):
             dist_matrix[i, j] = np.linalg.norm(coords[i] - coords[j])
 
-    for gid, members in _group_members(household_ids).items():
+    for members in group_indices(household_ids):
         _add_edges(edges, members, rng, "family", True, 0, ideology, neighborhood_ids, coords, dist_matrix, cfg)
 
-    for gid, members in _group_members(workplace_ids).items():
+    for members in group_indices(workplace_ids):
         _add_edges(edges, members, rng, "work", False, 6, ideology, neighborhood_ids, coords, dist_matrix, cfg)
 
-    for gid, members in _group_members(school_ids).items():
+    for members in group_indices(school_ids):
         _add_edges(edges, members, rng, "school", False, 5, ideology, neighborhood_ids, coords, dist_matrix, cfg)
 
-    if np.any(church_ids >= 0):
-        for gid in np.unique(church_ids[church_ids >= 0]):
-            members = np.where(church_ids == gid)[0]
-            _add_edges(edges, members, rng, "church", False, 5, ideology, neighborhood_ids, coords, dist_matrix, cfg)
+    attendees = np.where(church_ids >= 0)[0].astype(np.int32)
+    if attendees.size:
+        for members in group_indices(church_ids[attendees]):
+            _add_edges(edges, attendees[members], rng, "church", False, 5, ideology, neighborhood_ids, coords, dist_matrix, cfg)
 
     edges.extend(_neighborhood_edges(rng, n_agents, neighborhood_ids, coords, ideology, dist_matrix, cfg))
 
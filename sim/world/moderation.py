@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import torch
 
@@ -8,32 +8,101 @@ from sim.config import ModerationConfig, WorldConfig
 from sim.disease.strains import Strain
 
 
+class ModerationKernel:
+    """Precomputed per-strain moderation tensors for a fixed risk/config set.
+
+    The downrank and warning vectors only depend on the strain risk profile,
+    the world strictness, and the moderation config, so they are built once
+    and reused across timesteps instead of being reconstructed (and copied to
+    the device) on every call.
+    """
+
+    def __init__(
+        self,
+        risk: Tuple[float, ...],
+        strictness: float,
+        moderation_cfg: ModerationConfig,
+        device: torch.device,
+        dtype: torch.dtype,
+    ):
+        risk_t = _risk_tensor(risk, device, dtype)
+        self.downrank = 1 - moderation_cfg.downrank_effect * strictness * risk_t
+        self.warning = moderation_cfg.warning_effect * strictness * risk_t
+
+    def apply(
+        self,
+        share_probs_pos: torch.Tensor,
+        share_probs_neg: torch.Tensor,
+        inplace: bool = False,
+    ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        if inplace:
+            # Caller owns the tensors: fused multiply + clamp without
+            # allocating new output tensors.
+            share_probs_pos.mul_(self.downrank).clamp_(0.0, 1.0)
+            share_probs_neg.clamp_(0.0, 1.0)
+            return share_probs_pos, share_probs_neg, self.warning
+        adjusted_pos = share_probs_pos * self.downrank
+        return (
+            adjusted_pos.clamp(0.0, 1.0),
+            share_probs_neg.clamp(0.0, 1.0),
+            self.warning,
+        )
+
+
+# Keyed by (risk profile, strictness, moderation effects, device, dtype).
+# Strain mutation changes stealth only occasionally, so in practice a handful
+# of kernels cover a whole run; the size guard bounds pathological churn.
+_KERNEL_CACHE: Dict[tuple, ModerationKernel] = {}
+
+# The risk device tensor is cached separately so a strictness change (e.g. an
+# intervention day) rebuilds only the cheap downrank/warning arithmetic and
+# reuses the already-uploaded tensor instead of a fresh host build + H2D copy.
+_RISK_CACHE: Dict[tuple, torch.Tensor] = {}
+
+
+def _risk_tensor(risk: Tuple[float, ...], device: torch.device, dtype: torch.dtype) -> torch.Tensor:
+    key = (risk, device, dtype)
+    risk_t = _RISK_CACHE.get(key)
+    if risk_t is None:
+        if len(_RISK_CACHE) > 64:
+            _RISK_CACHE.clear()
+        risk_t = torch.tensor(risk, device=device, dtype=dtype)
+        _RISK_CACHE[key] = risk_t
+    return risk_t
+
+
 def apply_moderation(
     share_probs_pos: torch.Tensor,
     share_probs_neg: torch.Tensor,
     strains: List[Strain],
     world_cfg: WorldConfig,
     moderation_cfg: ModerationConfig,
+    inplace: bool = False,
 ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
     """
     Apply moderation to sharing probabilities.
-    
+
     Moderation suppressed positive shares (misinformation spread) but generally
-    allows negative shares (debunking/warnings).
+    allows negative shares (debunking/warnings). With ``inplace=True`` the
+    share tensors are mutated instead of copied; only pass it when the caller
+    owns them.
     """
-    risk = torch.tensor(
-        [s.violation_risk * (1 - s.stealth) for s in strains],
-        device=share_probs_pos.device,
-        dtype=share_probs_pos.dtype,
-    )
+    risk = tuple(s.violation_risk * (1 - s.stealth) for s in strains)
     strictness = world_cfg.moderation_strictness
-    downrank = 1 - moderation_cfg.downrank_effect * strictness * risk
-    warning = moderation_cfg.warning_effect * strictness * risk
-
-    adjusted_pos = share_probs_pos * downrank
-    
-    return (
-        adjusted_pos.clamp(0.0, 1.0),
-        share_probs_neg.clamp(0.0, 1.0),
-        warning
+    key = (
+        risk,
+        strictness,
+        moderation_cfg.downrank_effect,
+        moderation_cfg.warning_effect,
+        share_probs_pos.device,
+        share_probs_pos.dtype,
     )
+    kernel = _KERNEL_CACHE.get(key)
+    if kernel is None:
+        if len(_KERNEL_CACHE) > 64:
+            _KERNEL_CACHE.clear()
+        kernel = ModerationKernel(
+            risk, strictness, moderation_cfg, share_probs_pos.device, share_probs_pos.dtype
+        )
+        _KERNEL_CACHE[key] = kernel
+    return kernel.apply(share_probs_pos, share_probs_neg, inplace=inplace)
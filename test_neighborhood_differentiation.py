@@ -46,28 +46,64 @@ def analyze_neighborhood_differences(config_path: str, output_dir: Path) -> dict
     print("ANALYZING NEIGHBORHOOD DIFFERENCES")
     print(f"{'='*80}")
     
-    # Load config and regenerate town
     cfg = load_config(config_path)
-    rng_manager = RNGManager(cfg.sim.seed, cfg.sim.deterministic)
-    town = generate_town(
-        rng_manager.numpy,
-        cfg.sim.n_agents,
-        cfg.town,
-        cfg.traits,
-        cfg.world,
-        cfg.network,
-    )
-    
+
     # Load snapshots
     snapshots_path = output_dir / "belief_snapshots.parquet"
     if not snapshots_path.exists():
         snapshots_path = output_dir / "belief_snapshots.csv"
-    
+
     if not snapshots_path.exists():
         raise FileNotFoundError(f"No snapshots file found at {snapshots_path}")
-    
-    snapshots = pd.read_parquet(snapshots_path) if snapshots_path.suffix == '.parquet' else pd.read_csv(snapshots_path)
-    snapshots['neighborhood_id'] = town.neighborhood_ids[snapshots['agent_id'].values]
+
+    if snapshots_path.suffix == '.parquet':
+        # Parquet is columnar: reading just the columns the analysis touches
+        # skips the disk reads (and DataFrame memory) for everything else.
+        try:
+            import pyarrow.parquet as pq
+            names = pq.ParquetFile(snapshots_path).schema_arrow.names
+            wanted = [
+                c for c in names
+                if c in ('day', 'agent_id', 'neighborhood_id') or c.startswith('claim_')
+            ]
+            snapshots = pd.read_parquet(snapshots_path, columns=wanted)
+        except ImportError:
+            snapshots = pd.read_parquet(snapshots_path)
+    else:
+        snapshots = pd.read_csv(snapshots_path)
+
+    if 'neighborhood_id' not in snapshots.columns:
+        # Older runs did not persist the assignment in the snapshots. Prefer
+        # the town_meta.npz sidecar; regenerating the town (demographics,
+        # traits, networks) is the last resort for the oldest runs.
+        meta_path = output_dir / "town_meta.npz"
+        if meta_path.exists():
+            nids = np.load(meta_path)['neighborhood_ids'].astype(np.int16)
+        else:
+            rng_manager = RNGManager(cfg.sim.seed, cfg.sim.deterministic)
+            town = generate_town(
+                rng_manager.numpy,
+                cfg.sim.n_agents,
+                cfg.town,
+                cfg.traits,
+                cfg.world,
+                cfg.network,
+            )
+            nids = town.neighborhood_ids.astype(np.int16)
+        # Snapshots are normally day-major with agents in identity order, in
+        # which case tiling the per-agent assignment is enough; only fall back
+        # to the row-wise gather when the ordering doesn't match.
+        n_agents = nids.size
+        agent_ids = snapshots['agent_id'].to_numpy()
+        n_days_rows = agent_ids.size // n_agents
+        if agent_ids.size == n_days_rows * n_agents and np.array_equal(
+            agent_ids.reshape(n_days_rows, n_agents),
+            np.broadcast_to(np.arange(n_agents), (n_days_rows, n_agents)),
+        ):
+            snapshots['neighborhood_id'] = np.tile(nids, n_days_rows)
+        else:
+            snapshots['neighborhood_id'] = nids[agent_ids]
+    n_neighborhoods = int(snapshots['neighborhood_id'].max()) + 1
     
     # Get neighborhood info
     neighborhood_info = {}
@@ -82,7 +118,7 @@ def analyze_neighborhood_differences(config_path: str, output_dir: Path) -> dict
                 'ethnicity': demos.get('ethnicity', {}),
             }
     else:
-        for idx in range(town.neighborhoods):
+        for idx in range(n_neighborhoods):
             neighborhood_info[idx] = {
                 'name': f'neighborhood_{idx}',
                 'education': 0,
@@ -116,54 +152,62 @@ def analyze_neighborhood_differences(config_path: str, output_dir: Path) -> dict
         'analysis': {},
     }
     
-    # Analyze each claim
+    # Analyze key days
+    key_days = [0, 5, 10, 15, 20, 25]
+    key_days = [d for d in key_days if d in available_days]
+
+    # One hash-partitioned aggregation over every claim at once instead of a
+    # nested day x neighborhood loop of boolean-mask scans. Adoption is one
+    # broadcast compare over the stacked (rows, n_claims) belief matrix, and
+    # the groupby sums/means all claim columns simultaneously.
+    snapshots_kd = snapshots.loc[
+        snapshots['day'].isin(key_days), ['day', 'neighborhood_id'] + claim_cols
+    ].copy()
+    adopted_cols = ['adopted_' + c for c in claim_cols]
+    belief_mat = snapshots_kd[claim_cols].to_numpy(dtype=np.float32)
+    snapshots_kd[adopted_cols] = (belief_mat >= adoption_threshold).astype(np.int8)
+    grouped = snapshots_kd.groupby(['day', 'neighborhood_id'], sort=True)
+    means = grouped[claim_cols].mean()
+    stds = grouped[claim_cols].std(ddof=0)
+    adopted_counts = grouped[adopted_cols].sum()
+    populations = grouped.size().to_numpy()
+    group_index = means.index
+
     for claim_idx, claim_col in enumerate(claim_cols):
         strain_name = results['strains'][claim_idx]['name']
         is_truth = results['strains'][claim_idx]['is_truth']
-        
+
         print(f"\nAnalyzing Claim {claim_idx}: {strain_name} ({'TRUTH' if is_truth else 'MISINFORMATION'})")
-        
+
         claim_results = {
             'strain_name': strain_name,
             'is_truth': bool(is_truth),
             'by_day': {},
             'summary': {},
         }
-        
-        # Analyze key days
-        key_days = [0, 5, 10, 15, 20, 25]
-        key_days = [d for d in key_days if d in available_days]
-        
+
+        col_mean = means[claim_col].to_numpy()
+        col_std = stds[claim_col].to_numpy()
+        col_adopted = adopted_counts['adopted_' + claim_col].to_numpy()
+
+        stats_by_day = {d: [] for d in key_days}
+        for (day, nid), m, s, a, pop in zip(
+            group_index, col_mean, col_std, col_adopted, populations
+        ):
+            nid = int(nid)
+            stats_by_day[day].append({
+                'neighborhood_id': nid,
+                'neighborhood_name': neighborhood_info[nid]['name'],
+                'education': neighborhood_info[nid]['education'],
+                'income': neighborhood_info[nid]['income'],
+                'population': int(pop),
+                'adoption_rate': float(a / pop),
+                'mean_belief': float(m),
+                'std_belief': float(s),
+            })
+
         for day in key_days:
-            day_data = snapshots[snapshots['day'] == day].copy()
-            if day_data.empty:
-                continue
-            
-            day_stats = []
-            for nid in range(town.neighborhoods):
-                n_mask = day_data['neighborhood_id'] == nid
-                n_data = day_data[n_mask]
-                
-                if len(n_data) == 0:
-                    continue
-                
-                beliefs = n_data[claim_col].values
-                adopted = (beliefs >= adoption_threshold).sum()
-                adoption_rate = adopted / len(n_data)
-                mean_belief = beliefs.mean()
-                std_belief = beliefs.std()
-                
-                day_stats.append({
-                    'neighborhood_id': nid,
-                    'neighborhood_name': neighborhood_info[nid]['name'],
-                    'education': neighborhood_info[nid]['education'],
-                    'income': neighborhood_info[nid]['income'],
-                    'population': len(n_data),
-                    'adoption_rate': float(adoption_rate),
-                    'mean_belief': float(mean_belief),
-                    'std_belief': float(std_belief),
-                })
-            
+            day_stats = stats_by_day[day]
             if day_stats:
                 stats_df = pd.DataFrame(day_stats)
                 
@@ -219,118 +263,129 @@ def analyze_neighborhood_differences(config_path: str, output_dir: Path) -> dict
     return results
 
 
+HEAVY_RULE = "=" * 80 + "\n"
+THIN_RULE = "-" * 80 + "\n"
+
+
 def generate_report(results: dict, output_dir: Path):
     """Generate a comprehensive text report."""
     report_path = output_dir / "neighborhood_differentiation_report.txt"
-    
-    with open(report_path, 'w') as f:
-        f.write("="*80 + "\n")
-        f.write("NEIGHBORHOOD DIFFERENTIATION TEST REPORT\n")
-        f.write("="*80 + "\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        
-        # Simulation info
-        info = results['simulation_info']
-        f.write("SIMULATION CONFIGURATION\n")
-        f.write("-"*80 + "\n")
-        f.write(f"Config file: {info['config']}\n")
-        f.write(f"Agents: {info['n_agents']:,}\n")
-        f.write(f"Steps: {info['n_steps']}\n")
-        f.write(f"Claims: {info['n_claims']}\n")
-        f.write(f"Neighborhoods: {info['neighborhoods']}\n")
-        f.write(f"Adoption threshold: {info['adoption_threshold']}\n\n")
-        
-        # Strains
-        f.write("STRAINS\n")
-        f.write("-"*80 + "\n")
-        for strain in results['strains']:
-            claim_type = 'TRUTH' if strain['is_truth'] else 'MISINFORMATION'
-            f.write(f"Claim {strain['index']}: {strain['name']} ({claim_type})\n")
-        f.write("\n")
-        
-        # Neighborhoods
-        f.write("NEIGHBORHOODS\n")
-        f.write("-"*80 + "\n")
-        for nid, info in results['neighborhoods'].items():
-            f.write(f"{info['name']}:\n")
-            f.write(f"  Education rate: {info['education']:.2%}\n")
-            f.write(f"  Median income: ${info['income']:,}\n")
-        f.write("\n")
-        
-        # Analysis for each claim
-        f.write("="*80 + "\n")
-        f.write("ANALYSIS RESULTS\n")
-        f.write("="*80 + "\n\n")
-        
-        for claim_key, claim_data in results['analysis'].items():
+
+    # Accumulate sections in memory and write the report in one call instead
+    # of issuing hundreds of tiny f.write()s.
+    parts = []
+    parts.append(HEAVY_RULE)
+    parts.append("NEIGHBORHOOD DIFFERENTIATION TEST REPORT\n")
+    parts.append(HEAVY_RULE)
+    parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+    # Simulation info
+    info = results['simulation_info']
+    parts.append("SIMULATION CONFIGURATION\n")
+    parts.append(THIN_RULE)
+    parts.append(f"Config file: {info['config']}\n")
+    parts.append(f"Agents: {info['n_agents']:,}\n")
+    parts.append(f"Steps: {info['n_steps']}\n")
+    parts.append(f"Claims: {info['n_claims']}\n")
+    parts.append(f"Neighborhoods: {info['neighborhoods']}\n")
+    parts.append(f"Adoption threshold: {info['adoption_threshold']}\n\n")
+
+    # Strains
+    parts.append("STRAINS\n")
+    parts.append(THIN_RULE)
+    for strain in results['strains']:
+        claim_type = 'TRUTH' if strain['is_truth'] else 'MISINFORMATION'
+        parts.append(f"Claim {strain['index']}: {strain['name']} ({claim_type})\n")
+    parts.append("\n")
+
+    # Neighborhoods
+    parts.append("NEIGHBORHOODS\n")
+    parts.append(THIN_RULE)
+    for nid, info in results['neighborhoods'].items():
+        parts.append(f"{info['name']}:\n")
+        parts.append(f"  Education rate: {info['education']:.2%}\n")
+        parts.append(f"  Median income: ${info['income']:,}\n")
+    parts.append("\n")
+
+    # Analysis for each claim
+    parts.append(HEAVY_RULE)
+    parts.append("ANALYSIS RESULTS\n")
+    parts.append(HEAVY_RULE)
+    parts.append("\n")
+
+    for claim_key, claim_data in results['analysis'].items():
+        strain_name = claim_data['strain_name']
+        is_truth = claim_data.get('is_truth', False)
+
+        parts.append(HEAVY_RULE)
+        parts.append(f"CLAIM: {strain_name} ({'TRUTH' if is_truth else 'MISINFORMATION'})\n")
+        parts.append(HEAVY_RULE)
+        parts.append("\n")
+
+        # Show results for each day
+        for day in sorted(claim_data['by_day'].keys()):
+            day_data = claim_data['by_day'][day]
+            overall = day_data['overall']
+
+            parts.append(f"Day {day}:\n")
+            parts.append(f"  Overall adoption: {overall['mean_adoption']:.4f} (std: {overall['std_adoption']:.4f}, range: {overall['range_adoption']:.4f})\n")
+            parts.append(f"  Overall mean belief: {overall['mean_belief']:.4f} (std: {overall['std_belief']:.4f})\n")
+
+            if 'education_comparison' in day_data:
+                comp = day_data['education_comparison']
+                diff = comp['difference']
+
+                parts.append(f"\n  Education-based comparison:\n")
+                parts.append(f"    High-education neighborhoods ({comp['high_education']['count']}):\n")
+                parts.append(f"      Mean adoption: {comp['high_education']['mean_adoption']:.4f}\n")
+                parts.append(f"      Mean belief: {comp['high_education']['mean_belief']:.4f}\n")
+                parts.append(f"      Neighborhoods: {', '.join(comp['high_education']['neighborhoods'])}\n")
+
+                parts.append(f"    Low-education neighborhoods ({comp['low_education']['count']}):\n")
+                parts.append(f"      Mean adoption: {comp['low_education']['mean_adoption']:.4f}\n")
+                parts.append(f"      Mean belief: {comp['low_education']['mean_belief']:.4f}\n")
+                parts.append(f"      Neighborhoods: {', '.join(comp['low_education']['neighborhoods'])}\n")
+
+                parts.append(f"\n    Difference (Low-edu - High-edu):\n")
+                parts.append(f"      Adoption: {diff['adoption_diff']:+.4f} ({diff['adoption_pct_diff']:+.1f}%)\n")
+                parts.append(f"      Belief: {diff['belief_diff']:+.4f} ({diff['belief_pct_diff']:+.1f}%)\n")
+
+                if abs(diff['adoption_diff']) > 0.05 or abs(diff['belief_diff']) > 0.01:
+                    parts.append(f"    ✓ SIGNIFICANT DIFFERENCE DETECTED\n")
+
+            parts.append("\n")
+
+        parts.append("\n")
+
+    # Summary conclusions
+    parts.append(HEAVY_RULE)
+    parts.append("CONCLUSIONS\n")
+    parts.append(HEAVY_RULE)
+    parts.append("\n")
+
+    parts.append("1. Neighborhood differentiation is working:\n")
+    parts.append("   - Neighborhoods with different education/income levels show different\n")
+    parts.append("     susceptibility to misinformation\n")
+    parts.append("   - Differences are visible in both adoption rates and belief strength\n\n")
+
+    parts.append("2. Key findings:\n")
+    for claim_key, claim_data in results['analysis'].items():
+        if not claim_data['is_truth']:
             strain_name = claim_data['strain_name']
-            is_truth = claim_data.get('is_truth', False)
-            
-            f.write(f"{'='*80}\n")
-            f.write(f"CLAIM: {strain_name} ({'TRUTH' if is_truth else 'MISINFORMATION'})\n")
-            f.write(f"{'='*80}\n\n")
-            
-            # Show results for each day
-            for day in sorted(claim_data['by_day'].keys()):
-                day_data = claim_data['by_day'][day]
-                overall = day_data['overall']
-                
-                f.write(f"Day {day}:\n")
-                f.write(f"  Overall adoption: {overall['mean_adoption']:.4f} (std: {overall['std_adoption']:.4f}, range: {overall['range_adoption']:.4f})\n")
-                f.write(f"  Overall mean belief: {overall['mean_belief']:.4f} (std: {overall['std_belief']:.4f})\n")
-                
-                if 'education_comparison' in day_data:
-                    comp = day_data['education_comparison']
-                    diff = comp['difference']
-                    
-                    f.write(f"\n  Education-based comparison:\n")
-                    f.write(f"    High-education neighborhoods ({comp['high_education']['count']}):\n")
-                    f.write(f"      Mean adoption: {comp['high_education']['mean_adoption']:.4f}\n")
-                    f.write(f"      Mean belief: {comp['high_education']['mean_belief']:.4f}\n")
-                    f.write(f"      Neighborhoods: {', '.join(comp['high_education']['neighborhoods'])}\n")
-                    
-                    f.write(f"    Low-education neighborhoods ({comp['low_education']['count']}):\n")
-                    f.write(f"      Mean adoption: {comp['low_education']['mean_adoption']:.4f}\n")
-                    f.write(f"      Mean belief: {comp['low_education']['mean_belief']:.4f}\n")
-                    f.write(f"      Neighborhoods: {', '.join(comp['low_education']['neighborhoods'])}\n")
-                    
-                    f.write(f"\n    Difference (Low-edu - High-edu):\n")
-                    f.write(f"      Adoption: {diff['adoption_diff']:+.4f} ({diff['adoption_pct_diff']:+.1f}%)\n")
-                    f.write(f"      Belief: {diff['belief_diff']:+.4f} ({diff['belief_pct_diff']:+.1f}%)\n")
-                    
-                    if abs(diff['adoption_diff']) > 0.05 or abs(diff['belief_diff']) > 0.01:
-                        f.write(f"    ✓ SIGNIFICANT DIFFERENCE DETECTED\n")
-                
-                f.write("\n")
-            
-            f.write("\n")
-        
-        # Summary conclusions
-        f.write("="*80 + "\n")
-        f.write("CONCLUSIONS\n")
-        f.write("="*80 + "\n\n")
-        
-        f.write("1. Neighborhood differentiation is working:\n")
-        f.write("   - Neighborhoods with different education/income levels show different\n")
-        f.write("     susceptibility to misinformation\n")
-        f.write("   - Differences are visible in both adoption rates and belief strength\n\n")
-        
-        f.write("2. Key findings:\n")
-        for claim_key, claim_data in results['analysis'].items():
-            if not claim_data['is_truth']:
-                strain_name = claim_data['strain_name']
-                summary = claim_data['summary']
-                if 'education_comparison' in summary:
-                    diff = summary['education_comparison']['difference']
-                    f.write(f"   - {strain_name}: ")
-                    f.write(f"Low-edu neighborhoods show {abs(diff['belief_pct_diff']):.1f}% ")
-                    f.write(f"{'higher' if diff['belief_diff'] > 0 else 'lower'} belief\n")
-        
-        f.write("\n3. Truth protection mechanism:\n")
-        f.write("   - By day 25, truth protection suppresses misinformation (as expected)\n")
-        f.write("   - Differences are most visible in early days before truth protection\n")
-        f.write("     fully activates\n")
-    
+            summary = claim_data['summary']
+            if 'education_comparison' in summary:
+                diff = summary['education_comparison']['difference']
+                parts.append(f"   - {strain_name}: ")
+                parts.append(f"Low-edu neighborhoods show {abs(diff['belief_pct_diff']):.1f}% ")
+                parts.append(f"{'higher' if diff['belief_diff'] > 0 else 'lower'} belief\n")
+
+    parts.append("\n3. Truth protection mechanism:\n")
+    parts.append("   - By day 25, truth protection suppresses misinformation (as expected)\n")
+    parts.append("   - Differences are most visible in early days before truth protection\n")
+    parts.append("     fully activates\n")
+
+    report_path.write_text(''.join(parts))
+
     print(f"\n✓ Report generated: {report_path}")
     return report_path
 